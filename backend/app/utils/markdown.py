@@ -4,47 +4,102 @@ This implementation mirrors the frontend markdown service to ensure consistency
 """
 
 import re
+from functools import lru_cache
+
+H1_REGEX = re.compile(r"^#\s+(.+)$", re.MULTILINE)
+H1_REMOVE_REGEX = re.compile(r"^#\s+(.+)($|\n)", re.MULTILINE)
+DEFAULT_TITLE = "Untitled Note"
+EMPTY_NOTE_TITLE = "New Note"
+EMPTY_NOTE = f"# {EMPTY_NOTE_TITLE}\n\n"
+
+# Only bodies up to this length are memoized, so the caches never pin large notes in memory.
+CACHE_MAX_CONTENT_LENGTH = 4096
+
+
+def extract_title(content: str) -> str:
+    """
+    Extract title from markdown content.
+    Looks for the first H1 heading (# Title).
+    """
+    if len(content) <= CACHE_MAX_CONTENT_LENGTH:
+        return _extract_title_cached(content)
+    return _extract_title(content)
+
+
+def _extract_title(content: str) -> str:
+    """Uncached body of extract_title."""
+    # H1_REGEX only matches at a line start, so skip it when no line starts with "#".
+    if not content.startswith("#") and "\n#" not in content:
+        return DEFAULT_TITLE
+    match = H1_REGEX.search(content)
+    return match.group(1).strip() if match else DEFAULT_TITLE
+
+
+_extract_title_cached = lru_cache(maxsize=512)(_extract_title)
+
+
+def format_content(content: str) -> str:
+    """
+    Format note content to ensure proper structure.
+    Ensures content has proper spacing and formatting.
+    """
+    if len(content) <= CACHE_MAX_CONTENT_LENGTH:
+        return _format_content_cached(content)
+    return _format_content(content)
+
+
+def _format_content(content: str) -> str:
+    """Uncached body of format_content. Must stay side-effect free, since short inputs are memoized."""
+    cleaned = content.strip()
+
+    # A document that is only "# Title" gets blank lines appended for editing.
+    # Equivalent to comparing against f"# {extract_title(cleaned)}", but checks
+    # the string in place instead of regex-scanning it and rebuilding the heading.
+    if cleaned.startswith("# ") and not cleaned[2].isspace() and "\n" not in cleaned:
+        return f"{cleaned}\n\n"
+    return cleaned
+
+
+_format_content_cached = lru_cache(maxsize=256)(_format_content)
+
+
+def remove_h1(content: str) -> str:
+    """
+    Remove the H1 title heading from markdown content.
+    Used to avoid duplicating the title in rendered content.
+    Captures the newline after the heading to avoid extra blank lines.
+    Only removes the first H1 heading found.
+    """
+    # Without a "#" at the start of some line there is nothing for the regex to match.
+    if not content.startswith("#") and "\n#" not in content:
+        return content.strip()
+    return H1_REMOVE_REGEX.sub("", content, count=1).strip()
+
+
+def create_empty_note(title: str = EMPTY_NOTE_TITLE) -> str:
+    """Create a new empty note content template."""
+    if title == EMPTY_NOTE_TITLE:
+        return EMPTY_NOTE
+    return f"# {title}\n\n"
 
 
 class MarkdownService:
     """
     Markdown processing service with consistent behavior across frontend/backend.
+    Holds no state: the methods are the module-level functions above, attached as
+    staticmethods so calls through an instance go straight to them.
     """
 
-    H1_REGEX = re.compile(r"^#\s+(.+)$", re.MULTILINE)
-    H1_REMOVE_REGEX = re.compile(r"^#\s+(.+)($|\n)", re.MULTILINE)
-    DEFAULT_TITLE = "Untitled Note"
-
-    def extract_title(self, content: str) -> str:
-        """
-        Extract title from markdown content.
-        Looks for the first H1 heading (# Title).
-        """
-        match = self.H1_REGEX.search(content)
-        return match.group(1).strip() if match else self.DEFAULT_TITLE
-
-    def format_content(self, content: str) -> str:
-        """
-        Format note content to ensure proper structure.
-        Ensures content has proper spacing and formatting.
-        """
-        cleaned = content.strip()
-        title = self.extract_title(cleaned)
-
-        return f"# {title}\n\n" if cleaned == f"# {title}" else cleaned
-
-    def remove_h1(self, content: str) -> str:
-        """
-        Remove the H1 title heading from markdown content.
-        Used to avoid duplicating the title in rendered content.
-        Captures the newline after the heading to avoid extra blank lines.
-        Only removes the first H1 heading found.
-        """
-        return self.H1_REMOVE_REGEX.sub("", content, count=1).strip()
-
-    def create_empty_note(self, title: str = "New Note") -> str:
-        """Create a new empty note content template."""
-        return f"# {title}\n\n"
+    H1_REGEX = H1_REGEX
+    H1_REMOVE_REGEX = H1_REMOVE_REGEX
+    DEFAULT_TITLE = DEFAULT_TITLE
+    EMPTY_NOTE_TITLE = EMPTY_NOTE_TITLE
+    EMPTY_NOTE = EMPTY_NOTE
+
+    extract_title = staticmethod(extract_title)
+    format_content = staticmethod(format_content)
+    remove_h1 = staticmethod(remove_h1)
+    create_empty_note = staticmethod(create_empty_note)
 
 
 # Singleton instance for convenience
@@ -3,6 +3,7 @@ Unit tests for authentication dependencies (app.auth.dependencies).
 Tests dependency functions for protected routes and user authentication.
 """
 
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, Mock, patch
 
 import httpx
@@ -22,6 +23,13 @@ from app.models.models import User
 from app.schemas.schemas import TokenData
 
 
+def _mock_result(user):
+    """Build a mock SQLAlchemy result whose scalar_one_or_none returns ``user``."""
+    result = Mock()
+    result.scalar_one_or_none.return_value = user
+    return result
+
+
 class TestGetCurrentUser:
     """Test get_current_user dependency function."""
 
@@ -37,9 +45,7 @@ class TestGetCurrentUser:
 
         # Create a mock async session that returns the user
         mock_session = AsyncMock(spec=AsyncSession)
-        mock_result = Mock()
-        mock_result.scalar_one_or_none.return_value = sample_user
-        mock_session.execute.return_value = mock_result
+        mock_session.execute.return_value = _mock_result(sample_user)
 
         # Call dependency
         result = await get_current_user(credentials, mock_session)
@@ -87,9 +93,7 @@ class TestGetCurrentUser:
 
         # Mock session that returns None (user not found)
         mock_session = AsyncMock(spec=AsyncSession)
-        mock_result = Mock()
-        mock_result.scalar_one_or_none.return_value = None
-        mock_session.execute.return_value = mock_result
+        mock_session.execute.return_value = _mock_result(None)
 
         with pytest.raises(HTTPException) as exc_info:
             await get_current_user(credentials, mock_session)
@@ -179,9 +183,7 @@ class TestDependencyIntegration:
 
         # Mock async session
         mock_session = AsyncMock(spec=AsyncSession)
-        mock_result = Mock()
-        mock_result.scalar_one_or_none.return_value = sample_user
-        mock_session.execute.return_value = mock_result
+        mock_session.execute.return_value = _mock_result(sample_user)
 
         # Test get_current_user
         current_user = await get_current_user(credentials, mock_session)
@@ -243,10 +245,7 @@ class TestOIDCOpaqueTokenValidation:
     @pytest.mark.asyncio
     async def test_get_current_user_with_opaque_token_existing_user(self):
         """Test get_current_user resolves an existing OIDC user via opaque token."""
-        existing_user = Mock(spec=User)
-        existing_user.username = "oidcuser"
-        existing_user.oidc_sub = "authelia-sub-opaque-123"
-        existing_user.auth_provider = "oidc"
+        existing_user = SimpleNamespace(username="oidcuser", oidc_sub="authelia-sub-opaque-123", auth_provider="oidc")
 
         mock_oidc_claims = {
             "sub": "authelia-sub-opaque-123",
@@ -265,9 +264,7 @@ class TestOIDCOpaqueTokenValidation:
             mock_validator.extract_user_info.return_value = mock_user_info
 
             mock_session = AsyncMock(spec=AsyncSession)
-            mock_result = Mock()
-            mock_result.scalar_one_or_none.return_value = existing_user
-            mock_session.execute.return_value = mock_result
+            mock_session.execute.return_value = _mock_result(existing_user)
 
             credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials="authelia_at_opaque_token")
 
@@ -284,11 +281,12 @@ class TestOIDCOpaqueTokenValidation:
     @pytest.mark.asyncio
     async def test_get_current_user_with_opaque_token_new_user(self):
         """Test get_current_user auto-creates a new OIDC user via opaque token."""
-        new_user = Mock(spec=User)
-        new_user.username = "newoidcuser"
-        new_user.oidc_sub = "authelia-sub-opaque-new"
-        new_user.auth_provider = "oidc"
-        new_user.email = "new@example.com"
+        new_user = SimpleNamespace(
+            username="newoidcuser",
+            oidc_sub="authelia-sub-opaque-new",
+            auth_provider="oidc",
+            email="new@example.com",
+        )
 
         mock_oidc_claims = {
             "sub": "authelia-sub-opaque-new",
@@ -308,9 +306,7 @@ class TestOIDCOpaqueTokenValidation:
 
             # First call returns None (user not found), subsequent calls return created user
             mock_session = AsyncMock(spec=AsyncSession)
-            mock_result_none = Mock()
-            mock_result_none.scalar_one_or_none.return_value = None
-            mock_session.execute.return_value = mock_result_none
+            mock_session.execute.return_value = _mock_result(None)
 
             credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials="authelia_at_opaque_token")
 
@@ -398,9 +394,7 @@ class TestOIDCUserCreationRaceCondition:
 
             # Mock async session that returns the user
             mock_session = AsyncMock(spec=AsyncSession)
-            mock_result = Mock()
-            mock_result.scalar_one_or_none.return_value = existing_user
-            mock_session.execute.return_value = mock_result
+            mock_session.execute.return_value = _mock_result(existing_user)
 
             credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials="mock-oidc-token")
 
@@ -420,13 +414,6 @@ def _bearer(token: str = "some.oidc.token") -> HTTPAuthorizationCredentials:
     return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
 
 
-def _mock_result(user):
-    """Build a mock SQLAlchemy result whose scalar_one_or_none returns ``user``."""
-    result = Mock()
-    result.scalar_one_or_none.return_value = user
-    return result
-
-
 class TestOIDCBranchCoverage:
     """Exhaustive coverage of the OIDC branches in ``get_current_user``.
 
@@ -442,19 +429,21 @@ class TestOIDCBranchCoverage:
         mock_session = AsyncMock(spec=AsyncSession)
         credentials = _bearer()
 
-        with patch("app.auth.dependencies.verify_token", return_value=TokenData(username=None)):
-            with patch("app.auth.dependencies.oidc_validator") as mock_validator:
-                mock_validator.is_opaque_token.return_value = False
-                # OIDC then fails so the request ultimately 401s, but only *after*
-                # the local-JWT ``username is None`` branch has executed.
-                mock_validator.validate_oidc_token = AsyncMock(side_effect=ValueError("no oidc"))
+        with (
+            patch("app.auth.dependencies.verify_token", return_value=TokenData(username=None)),
+            patch("app.auth.dependencies.oidc_validator") as mock_validator,
+        ):
+            mock_validator.is_opaque_token.return_value = False
+            # OIDC then fails so the request ultimately 401s, but only *after*
+            # the local-JWT ``username is None`` branch has executed.
+            mock_validator.validate_oidc_token = AsyncMock(side_effect=ValueError("no oidc"))
 
-                with pytest.raises(HTTPException) as exc_info:
-                    await get_current_user(credentials, mock_session)
+            with pytest.raises(HTTPException) as exc_info:
+                await get_current_user(credentials, mock_session)
 
-                assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
-                # Confirms we reached the OIDC fallback rather than returning a user.
-                mock_validator.validate_oidc_token.assert_awaited_once()
+            assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
+            # Confirms we reached the OIDC fallback rather than returning a user.
+            mock_validator.validate_oidc_token.assert_awaited_once()
 
     @pytest.mark.asyncio
     async def test_oidc_token_missing_sub_raises_401(self):
@@ -462,52 +451,53 @@ class TestOIDCBranchCoverage:
         mock_session = AsyncMock(spec=AsyncSession)
         credentials = _bearer()
 
-        with patch("app.auth.dependencies.verify_token", side_effect=HTTPException(status_code=401)):
-            with patch("app.auth.dependencies.oidc_validator") as mock_validator:
-                mock_validator.is_opaque_token.return_value = False
-                mock_validator.validate_oidc_token = AsyncMock(return_value={"aud": "parchmark"})
-                mock_validator.extract_user_info.return_value = {}  # no oidc_sub
+        with (
+            patch("app.auth.dependencies.verify_token", side_effect=HTTPException(status_code=401)),
+            patch("app.auth.dependencies.oidc_validator") as mock_validator,
+        ):
+            mock_validator.is_opaque_token.return_value = False
+            mock_validator.validate_oidc_token = AsyncMock(return_value={"aud": "parchmark"})
+            mock_validator.extract_user_info.return_value = {}  # no oidc_sub
 
-                with pytest.raises(HTTPException) as exc_info:
-                    await get_current_user(credentials, mock_session)
+            with pytest.raises(HTTPException) as exc_info:
+                await get_current_user(credentials, mock_session)
 
-                assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
-                # The DB is never queried when the sub claim is missing.
-                mock_session.execute.assert_not_called()
+            assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
+            # The DB is never queried when the sub claim is missing.
+            mock_session.execute.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_userinfo_fallback_success_merges_and_creates_user(self):
         """When the access token carries a sub but no username, the userinfo
         endpoint is consulted and its claims are merged before user creation."""
-        created = Mock(spec=User)
-        created.username = "fetched_user"
-        created.oidc_sub = "sub-userinfo-ok"
-        created.email = "fetched@example.com"
+        created = SimpleNamespace(username="fetched_user", oidc_sub="sub-userinfo-ok", email="fetched@example.com")
 
         mock_session = AsyncMock(spec=AsyncSession)
         mock_session.execute.return_value = _mock_result(None)  # no existing user
         credentials = _bearer()
 
-        with patch("app.auth.dependencies.verify_token", side_effect=HTTPException(status_code=401)):
-            with patch("app.auth.dependencies.oidc_validator") as mock_validator:
-                mock_validator.is_opaque_token.return_value = False
-                mock_validator.validate_oidc_token = AsyncMock(return_value={"sub": "sub-userinfo-ok"})
-                mock_validator.extract_user_info.return_value = {"oidc_sub": "sub-userinfo-ok"}  # no username
-                mock_validator.get_userinfo = AsyncMock(
-                    return_value={"preferred_username": "fetched_user", "email": "fetched@example.com"}
-                )
+        with (
+            patch("app.auth.dependencies.verify_token", side_effect=HTTPException(status_code=401)),
+            patch("app.auth.dependencies.oidc_validator") as mock_validator,
+        ):
+            mock_validator.is_opaque_token.return_value = False
+            mock_validator.validate_oidc_token = AsyncMock(return_value={"sub": "sub-userinfo-ok"})
+            mock_validator.extract_user_info.return_value = {"oidc_sub": "sub-userinfo-ok"}  # no username
+            mock_validator.get_userinfo = AsyncMock(
+                return_value={"preferred_username": "fetched_user", "email": "fetched@example.com"}
+            )
 
-                with patch("app.auth.dependencies._create_oidc_user", new_callable=AsyncMock) as mock_create:
-                    mock_create.return_value = created
+            with patch("app.auth.dependencies._create_oidc_user", new_callable=AsyncMock) as mock_create:
+                mock_create.return_value = created
 
-                    result = await get_current_user(credentials, mock_session)
+                result = await get_current_user(credentials, mock_session)
 
-                assert result is created
-                mock_validator.get_userinfo.assert_awaited_once_with(credentials.credentials)
-                # Userinfo claims were merged into the dict handed to user creation.
-                created_info = mock_create.call_args.args[1]
-                assert created_info["username"] == "fetched_user"
-                assert created_info["email"] == "fetched@example.com"
+            assert result is created
+            mock_validator.get_userinfo.assert_awaited_once_with(credentials.credentials)
+            # Userinfo claims were merged into the dict handed to user creation.
+            created_info = mock_create.call_args.args[1]
+            assert created_info["username"] == "fetched_user"
+            assert created_info["email"] == "fetched@example.com"
 
     @pytest.mark.asyncio
     async def test_userinfo_fetch_raises_is_swallowed_then_401(self):
@@ -517,18 +507,20 @@ class TestOIDCBranchCoverage:
         mock_session.execute.return_value = _mock_result(None)
         credentials = _bearer()
 
-        with patch("app.auth.dependencies.verify_token", side_effect=HTTPException(status_code=401)):
-            with patch("app.auth.dependencies.oidc_validator") as mock_validator:
-                mock_validator.is_opaque_token.return_value = False
-                mock_validator.validate_oidc_token = AsyncMock(return_value={"sub": "sub-userinfo-boom"})
-                mock_validator.extract_user_info.return_value = {"oidc_sub": "sub-userinfo-boom"}
-                mock_validator.get_userinfo = AsyncMock(side_effect=httpx.HTTPError("userinfo down"))
+        with (
+            patch("app.auth.dependencies.verify_token", side_effect=HTTPException(status_code=401)),
+            patch("app.auth.dependencies.oidc_validator") as mock_validator,
+        ):
+            mock_validator.is_opaque_token.return_value = False
+            mock_validator.validate_oidc_token = AsyncMock(return_value={"sub": "sub-userinfo-boom"})
+            mock_validator.extract_user_info.return_value = {"oidc_sub": "sub-userinfo-boom"}
+            mock_validator.get_userinfo = AsyncMock(side_effect=httpx.HTTPError("userinfo down"))
 
-                with pytest.raises(HTTPException) as exc_info:
-                    await get_current_user(credentials, mock_session)
+            with pytest.raises(HTTPException) as exc_info:
+                await get_current_user(credentials, mock_session)
 
-                assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
-                mock_validator.get_userinfo.assert_awaited_once()
+            assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
+            mock_validator.get_userinfo.assert_awaited_once()
 
     @pytest.mark.asyncio
     async def test_userinfo_returns_no_username_then_401(self):
@@ -538,55 +530,55 @@ class TestOIDCBranchCoverage:
         mock_session.execute.return_value = _mock_result(None)
         credentials = _bearer()
 
-        with patch("app.auth.dependencies.verify_token", side_effect=HTTPException(status_code=401)):
-            with patch("app.auth.dependencies.oidc_validator") as mock_validator:
-                mock_validator.is_opaque_token.return_value = False
-                mock_validator.validate_oidc_token = AsyncMock(return_value={"sub": "sub-empty-userinfo"})
-                mock_validator.extract_user_info.return_value = {"oidc_sub": "sub-empty-userinfo"}
-                # No preferred_username / email / name -> username resolves to None.
-                mock_validator.get_userinfo = AsyncMock(return_value={})
+        with (
+            patch("app.auth.dependencies.verify_token", side_effect=HTTPException(status_code=401)),
+            patch("app.auth.dependencies.oidc_validator") as mock_validator,
+        ):
+            mock_validator.is_opaque_token.return_value = False
+            mock_validator.validate_oidc_token = AsyncMock(return_value={"sub": "sub-empty-userinfo"})
+            mock_validator.extract_user_info.return_value = {"oidc_sub": "sub-empty-userinfo"}
+            # No preferred_username / email / name -> username resolves to None.
+            mock_validator.get_userinfo = AsyncMock(return_value={})
 
-                with pytest.raises(HTTPException) as exc_info:
-                    await get_current_user(credentials, mock_session)
+            with pytest.raises(HTTPException) as exc_info:
+                await get_current_user(credentials, mock_session)
 
-                assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
+            assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
 
     @pytest.mark.asyncio
     async def test_auto_create_oidc_user_on_first_login(self):
         """A validated OIDC token with a username but no existing user triggers
         auto-creation and returns the newly created user."""
-        created = Mock(spec=User)
-        created.username = "brand_new"
-        created.oidc_sub = "sub-create"
+        created = SimpleNamespace(username="brand_new", oidc_sub="sub-create")
 
         mock_session = AsyncMock(spec=AsyncSession)
         mock_session.execute.return_value = _mock_result(None)
         user_info = {"oidc_sub": "sub-create", "username": "brand_new", "email": "new@example.com"}
         credentials = _bearer()
 
-        with patch("app.auth.dependencies.verify_token", side_effect=HTTPException(status_code=401)):
-            with patch("app.auth.dependencies.oidc_validator") as mock_validator:
-                mock_validator.is_opaque_token.return_value = False
-                mock_validator.validate_oidc_token = AsyncMock(return_value={"sub": "sub-create"})
-                mock_validator.extract_user_info.return_value = user_info
+        with (
+            patch("app.auth.dependencies.verify_token", side_effect=HTTPException(status_code=401)),
+            patch("app.auth.dependencies.oidc_validator") as mock_validator,
+        ):
+            mock_validator.is_opaque_token.return_value = False
+            mock_validator.validate_oidc_token = AsyncMock(return_value={"sub": "sub-create"})
+            mock_validator.extract_user_info.return_value = user_info
 
-                with patch("app.auth.dependencies._create_oidc_user", new_callable=AsyncMock) as mock_create:
-                    mock_create.return_value = created
+            with patch("app.auth.dependencies._create_oidc_user", new_callable=AsyncMock) as mock_create:
+                mock_create.return_value = created
 
-                    result = await get_current_user(credentials, mock_session)
+                result = await get_current_user(credentials, mock_session)
 
-                assert result is created
-                mock_create.assert_awaited_once_with(mock_session, user_info)
-                # Username was already present, so the userinfo endpoint is not consulted.
-                mock_validator.get_userinfo.assert_not_called()
+            assert result is created
+            mock_create.assert_awaited_once_with(mock_session, user_info)
+            # Username was already present, so the userinfo endpoint is not consulted.
+            mock_validator.get_userinfo.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_integrity_error_race_recovers_existing_user(self):
         """Concurrent creation raising IntegrityError triggers a rollback and a
         re-fetch that returns the user created by the winning request."""
-        raced_user = Mock(spec=User)
-        raced_user.username = "raced"
-        raced_user.oidc_sub = "sub-race"
+        raced_user = SimpleNamespace(username="raced", oidc_sub="sub-race")
 
         mock_session = AsyncMock(spec=AsyncSession)
         # 1st execute -> initial lookup (None); 2nd execute -> post-rollback re-fetch (winner).
@@ -595,24 +587,26 @@ class TestOIDCBranchCoverage:
 
         integrity_error = IntegrityError("INSERT INTO users", {}, Exception("duplicate key oidc_sub"))
 
-        with patch("app.auth.dependencies.verify_token", side_effect=HTTPException(status_code=401)):
-            with patch("app.auth.dependencies.oidc_validator") as mock_validator:
-                mock_validator.is_opaque_token.return_value = False
-                mock_validator.validate_oidc_token = AsyncMock(return_value={"sub": "sub-race"})
-                mock_validator.extract_user_info.return_value = {
-                    "oidc_sub": "sub-race",
-                    "username": "raced",
-                    "email": "raced@example.com",
-                }
+        with (
+            patch("app.auth.dependencies.verify_token", side_effect=HTTPException(status_code=401)),
+            patch("app.auth.dependencies.oidc_validator") as mock_validator,
+        ):
+            mock_validator.is_opaque_token.return_value = False
+            mock_validator.validate_oidc_token = AsyncMock(return_value={"sub": "sub-race"})
+            mock_validator.extract_user_info.return_value = {
+                "oidc_sub": "sub-race",
+                "username": "raced",
+                "email": "raced@example.com",
+            }
 
-                with patch("app.auth.dependencies._create_oidc_user", new_callable=AsyncMock) as mock_create:
-                    mock_create.side_effect = integrity_error
+            with patch("app.auth.dependencies._create_oidc_user", new_callable=AsyncMock) as mock_create:
+                mock_create.side_effect = integrity_error
 
-                    result = await get_current_user(credentials, mock_session)
+                result = await get_current_user(credentials, mock_session)
 
-                assert result is raced_user
-                mock_session.rollback.assert_awaited_once()
-                assert mock_session.execute.call_count == 2
+            assert result is raced_user
+            mock_session.rollback.assert_awaited_once()
+            assert mock_session.execute.call_count == 2
 
     @pytest.mark.asyncio
     async def test_integrity_error_race_refetch_none_raises_401(self):
@@ -625,24 +619,26 @@ class TestOIDCBranchCoverage:
 
         integrity_error = IntegrityError("INSERT INTO users", {}, Exception("duplicate key oidc_sub"))
 
-        with patch("app.auth.dependencies.verify_token", side_effect=HTTPException(status_code=401)):
-            with patch("app.auth.dependencies.oidc_validator") as mock_validator:
-                mock_validator.is_opaque_token.return_value = False
-                mock_validator.validate_oidc_token = AsyncMock(return_value={"sub": "sub-race-lost"})
-                mock_validator.extract_user_info.return_value = {
-                    "oidc_sub": "sub-race-lost",
-                    "username": "lost",
-                    "email": "lost@example.com",
-                }
+        with (
+            patch("app.auth.dependencies.verify_token", side_effect=HTTPException(status_code=401)),
+            patch("app.auth.dependencies.oidc_validator") as mock_validator,
+        ):
+            mock_validator.is_opaque_token.return_value = False
+            mock_validator.validate_oidc_token = AsyncMock(return_value={"sub": "sub-race-lost"})
+            mock_validator.extract_user_info.return_value = {
+                "oidc_sub": "sub-race-lost",
+                "username": "lost",
+                "email": "lost@example.com",
+            }
 
-                with patch("app.auth.dependencies._create_oidc_user", new_callable=AsyncMock) as mock_create:
-                    mock_create.side_effect = integrity_error
+            with patch("app.auth.dependencies._create_oidc_user", new_callable=AsyncMock) as mock_create:
+                mock_create.side_effect = integrity_error
 
-                    with pytest.raises(HTTPException) as exc_info:
-                        await get_current_user(credentials, mock_session)
+                with pytest.raises(HTTPException) as exc_info:
+                    await get_current_user(credentials, mock_session)
 
-                assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
-                mock_session.rollback.assert_awaited_once()
+            assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
+            mock_session.rollback.assert_awaited_once()
 
     @pytest.mark.asyncio
     async def test_outer_integrity_error_rolls_back_and_401(self):
@@ -653,17 +649,19 @@ class TestOIDCBranchCoverage:
 
         integrity_error = IntegrityError("SELECT", {}, Exception("db integrity"))
 
-        with patch("app.auth.dependencies.verify_token", side_effect=HTTPException(status_code=401)):
-            with patch("app.auth.dependencies.oidc_validator") as mock_validator:
-                mock_validator.is_opaque_token.return_value = False
-                mock_validator.validate_oidc_token = AsyncMock(return_value={"sub": "sub-outer"})
-                mock_validator.extract_user_info.side_effect = integrity_error
+        with (
+            patch("app.auth.dependencies.verify_token", side_effect=HTTPException(status_code=401)),
+            patch("app.auth.dependencies.oidc_validator") as mock_validator,
+        ):
+            mock_validator.is_opaque_token.return_value = False
+            mock_validator.validate_oidc_token = AsyncMock(return_value={"sub": "sub-outer"})
+            mock_validator.extract_user_info.side_effect = integrity_error
 
-                with pytest.raises(HTTPException) as exc_info:
-                    await get_current_user(credentials, mock_session)
+            with pytest.raises(HTTPException) as exc_info:
+                await get_current_user(credentials, mock_session)
 
-                assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
-                mock_session.rollback.assert_awaited_once()
+            assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
+            mock_session.rollback.assert_awaited_once()
 
     @pytest.mark.asyncio
     @pytest.mark.parametrize(
@@ -681,15 +679,17 @@ class TestOIDCBranchCoverage:
         mock_session = AsyncMock(spec=AsyncSession)
         credentials = _bearer()
 
-        with patch("app.auth.dependencies.verify_token", side_effect=HTTPException(status_code=401)):
-            with patch("app.auth.dependencies.oidc_validator") as mock_validator:
-                mock_validator.is_opaque_token.return_value = False
-                mock_validator.validate_oidc_token = AsyncMock(side_effect=validation_error)
+        with (
+            patch("app.auth.dependencies.verify_token", side_effect=HTTPException(status_code=401)),
+            patch("app.auth.dependencies.oidc_validator") as mock_validator,
+        ):
+            mock_validator.is_opaque_token.return_value = False
+            mock_validator.validate_oidc_token = AsyncMock(side_effect=validation_error)
 
-                with pytest.raises(HTTPException) as exc_info:
-                    await get_current_user(credentials, mock_session)
+            with pytest.raises(HTTPException) as exc_info:
+                await get_current_user(credentials, mock_session)
 
-                assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
+            assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
 
     @pytest.mark.asyncio
     async def test_unexpected_error_yields_401(self):
@@ -698,12 +698,14 @@ class TestOIDCBranchCoverage:
         mock_session = AsyncMock(spec=AsyncSession)
         credentials = _bearer()
 
-        with patch("app.auth.dependencies.verify_token", side_effect=HTTPException(status_code=401)):
-            with patch("app.auth.dependencies.oidc_validator") as mock_validator:
-                mock_validator.is_opaque_token.return_value = False
-                mock_validator.validate_oidc_token = AsyncMock(side_effect=RuntimeError("boom"))
+        with (
+            patch("app.auth.dependencies.verify_token", side_effect=HTTPException(status_code=401)),
+            patch("app.auth.dependencies.oidc_validator") as mock_validator,
+        ):
+            mock_validator.is_opaque_token.return_value = False
+            mock_validator.validate_oidc_token = AsyncMock(side_effect=RuntimeError("boom"))
 
-                with pytest.raises(HTTPException) as exc_info:
-                    await get_current_user(credentials, mock_session)
+            with pytest.raises(HTTPException) as exc_info:
+                await get_current_user(credentials, mock_session)
 
-                assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
+            assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
@@ -3,8 +3,10 @@ Error handling and edge case tests for OIDC validation.
 Tests failure scenarios and error recovery mechanisms.
 """
 
+from datetime import UTC, datetime, timedelta
 from unittest.mock import AsyncMock, Mock, patch
 
+import httpx
 import pytest
 from jwt import PyJWTError as JWTError
 
@@ -31,8 +33,6 @@ async def test_get_jwks_network_timeout():
         mock_get = AsyncMock()
         mock_client.return_value.get = mock_get
 
-        import httpx
-
         mock_get.side_effect = httpx.TimeoutException("Request timeout")
 
         with pytest.raises(httpx.TimeoutException):
@@ -188,8 +188,6 @@ async def test_get_jwks_cache_expiration():
         assert result1 == {"keys": []}
 
         # Manually set cache time to far past to simulate expiration
-        from datetime import UTC, datetime, timedelta
-
         validator.jwks_cache_time = datetime.now(UTC) - timedelta(seconds=2)
         validator._discovery_cache_time = datetime.now(UTC) - timedelta(seconds=2)
 
@@ -7,20 +7,10 @@ import pytest
 
 from app.utils.markdown import markdown_service
 
-
-def extract_title_from_markdown(content: str) -> str:
-    """Wrapper for backward compatibility with tests."""
-    return markdown_service.extract_title(content)
-
-
-def format_note_content(content: str) -> str:
-    """Wrapper for backward compatibility with tests."""
-    return markdown_service.format_content(content)
-
-
-def create_empty_note_content(title: str = "New Note") -> str:
-    """Wrapper for backward compatibility with tests."""
-    return markdown_service.create_empty_note(title)
+# Bound-method aliases kept for backward compatibility with the original helper names
+extract_title_from_markdown = markdown_service.extract_title
+format_note_content = markdown_service.format_content
+create_empty_note_content = markdown_service.create_empty_note
 
 
 class TestExtractTitleFromMarkdown:
@@ -283,43 +273,6 @@ class TestCreateEmptyNoteContent:
 
         assert content == "# New Note\n\n"
 
-    def test_create_empty_note_custom_title(self):
-        """Test creating empty note with custom title."""
-        content = create_empty_note_content("My Custom Title")
-
-        assert content == "# My Custom Title\n\n"
-
-    def test_create_empty_note_empty_title(self):
-        """Test creating empty note with empty title."""
-        content = create_empty_note_content("")
-
-        assert content == "# \n\n"
-
-    def test_create_empty_note_title_with_spaces(self):
-        """Test creating empty note with title containing spaces."""
-        content = create_empty_note_content("Title With Spaces")
-
-        assert content == "# Title With Spaces\n\n"
-
-    def test_create_empty_note_title_with_special_chars(self):
-        """Test creating empty note with special characters in title."""
-        content = create_empty_note_content("Title @#$%^&*()")
-
-        assert content == "# Title @#$%^&*()\n\n"
-
-    def test_create_empty_note_unicode_title(self):
-        """Test creating empty note with Unicode title."""
-        content = create_empty_note_content("标题 🚀")
-
-        assert content == "# 标题 🚀\n\n"
-
-    def test_create_empty_note_long_title(self):
-        """Test creating empty note with very long title."""
-        long_title = "Very " * 50 + "Long Title"
-        content = create_empty_note_content(long_title)
-
-        assert content == f"# {long_title}\n\n"
-
     def test_create_empty_note_none_title(self):
         """Test creating empty note with None title."""
         # This should use the default parameter
@@ -331,11 +284,16 @@ class TestCreateEmptyNoteContent:
         "title,expected",
         [
             ("Test", "# Test\n\n"),
+            ("My Custom Title", "# My Custom Title\n\n"),
             ("", "# \n\n"),
             ("Title with spaces", "# Title with spaces\n\n"),
+            ("Title @#$%^&*()", "# Title @#$%^&*()\n\n"),
             ("123 Numeric Title", "# 123 Numeric Title\n\n"),
             ("🎉 Emoji Title", "# 🎉 Emoji Title\n\n"),
+            ("标题 🚀", "# 标题 🚀\n\n"),
+            ("Very " * 50 + "Long Title", "# " + "Very " * 50 + "Long Title\n\n"),
         ],
+        ids=["simple", "custom", "empty", "spaces", "special_chars", "numeric", "emoji", "unicode", "long"],
     )
     def test_create_empty_note_parametrized(self, title, expected):
         """Test create_empty_note_content with various titles."""
@@ -6,12 +6,13 @@ from fastapi import HTTPException
 from app.routers.health import health_check
 from app.services.health_service import health_service
 
+pytestmark = pytest.mark.asyncio(loop_scope="module")
+
 
 class DummySession:
     """Lightweight stand-in for a SQLAlchemy async session."""
 
 
-@pytest.mark.asyncio
 async def test_health_check_returns_service_payload(monkeypatch):
     """The endpoint should proxy the health service payload on success."""
 
@@ -28,7 +29,6 @@ async def test_health_check_returns_service_payload(monkeypatch):
     assert result is expected_payload
 
 
-@pytest.mark.asyncio
 async def test_health_check_raises_http_exception_on_service_failure(monkeypatch):
     """The endpoint should convert service errors into HTTP 503 responses."""
 
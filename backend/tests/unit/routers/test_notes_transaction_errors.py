@@ -3,179 +3,139 @@ Unit tests for transaction error handling in notes router.
 Tests that database commit failures are properly handled with rollback and 500 responses.
 """
 
-from unittest.mock import AsyncMock, MagicMock
+from dataclasses import dataclass, field
+from datetime import datetime
+from types import SimpleNamespace
 
 import pytest
 from fastapi import HTTPException, status
 from sqlalchemy.exc import SQLAlchemyError
 
-from app.models.models import Note, User
 from app.routers.notes import create_note, delete_note, update_note
 from app.schemas.schemas import NoteCreate, NoteUpdate
 
+pytestmark = pytest.mark.asyncio(loop_scope="module")
+
+
+@dataclass
+class _FakeNote:
+    """Plain stand-in for a Note row; the service only reads and assigns attributes."""
+
+    id: str
+    user_id: int
+    title: str
+    content: str
+    tags: list = field(default_factory=list)
+    created_at: datetime = datetime(2024, 1, 1)
+    updated_at: datetime = datetime(2024, 1, 1)
+
+
+@pytest.fixture(scope="module")
+def fake_user():
+    """Create a stand-in authenticated user, shared read-only across the module."""
+    return SimpleNamespace(id=1, username="testuser")
+
+
+class FakeResult:
+    """Minimal stand-in for a SQLAlchemy Result returned by session.execute."""
+
+    def __init__(self, value):
+        self.value = value
+
+    def scalar_one_or_none(self):
+        return self.value
+
+
+class FakeAsyncSession:
+    """Lightweight stand-in for a SQLAlchemy async session.
+
+    Set ``*_exc`` to make the matching call raise; ``execute_results`` is consumed
+    in order, and any exception in it is raised instead of returned.
+    """
+
+    def __init__(self):
+        self.calls = []
+        self.commit_exc = None
+        self.delete_exc = None
+        self.execute_results = []
+
+    def add(self, obj):
+        self.calls.append(("add", obj))
+
+    async def commit(self):
+        self.calls.append(("commit",))
+        if self.commit_exc:
+            raise self.commit_exc
+
+    async def refresh(self, obj):
+        self.calls.append(("refresh", obj))
+
+    async def delete(self, obj):
+        self.calls.append(("delete", obj))
+        if self.delete_exc:
+            raise self.delete_exc
+
+    async def rollback(self):
+        self.calls.append(("rollback",))
+
+    async def execute(self, statement):
+        self.calls.append(("execute",))
+        result = self.execute_results.pop(0) if self.execute_results else FakeResult(None)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
 
 @pytest.fixture
-def mock_user():
-    """Create a mock authenticated user."""
-    user = MagicMock(spec=User)
-    user.id = 1
-    user.username = "testuser"
-    return user
+def session():
+    """Create a fake async database session."""
+    return FakeAsyncSession()
 
 
 @pytest.fixture
-def mock_db_session():
-    """Create a mock async database session."""
-    session = AsyncMock()
-    session.add = MagicMock()
-    session.commit = AsyncMock()
-    session.refresh = AsyncMock()
-    session.delete = AsyncMock()
-    session.rollback = AsyncMock()
-    session.execute = AsyncMock()
-    return session
-
-
-class TestCreateNoteTransactionError:
-    """Test transaction error handling in create_note endpoint."""
-
-    @pytest.mark.asyncio
-    async def test_create_note_commit_failure_returns_500(self, mock_user, mock_db_session):
-        """Test that commit failure returns 500 and triggers rollback."""
-        # Arrange
-        note_data = NoteCreate(title="Test Note", content="# Test Note\n\nContent here.")
-        mock_db_session.commit.side_effect = SQLAlchemyError("Database commit failed")
-
-        # Act & Assert
-        with pytest.raises(HTTPException) as exc_info:
-            await create_note(note_data, mock_user, mock_db_session)
-
-        assert exc_info.value.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
-        assert "Database error" in exc_info.value.detail
-        mock_db_session.rollback.assert_awaited_once()
-
-    @pytest.mark.asyncio
-    async def test_create_note_requery_failure_returns_500(self, mock_user, mock_db_session):
-        """Test that post-commit re-query failure returns 500 and triggers rollback."""
-        # Arrange
-        note_data = NoteCreate(title="Test Note", content="# Test Note\n\nContent here.")
-        mock_db_session.execute.side_effect = SQLAlchemyError("Database re-query failed")
-
-        # Act & Assert
-        with pytest.raises(HTTPException) as exc_info:
-            await create_note(note_data, mock_user, mock_db_session)
-
-        assert exc_info.value.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
-        assert "Database error" in exc_info.value.detail
-        mock_db_session.rollback.assert_awaited_once()
-
-
-class TestUpdateNoteTransactionError:
-    """Test transaction error handling in update_note endpoint."""
-
-    @pytest.fixture
-    def mock_existing_note(self):
-        """Create a mock existing note."""
-        note = MagicMock(spec=Note)
-        note.id = "test-note-1"
-        note.user_id = 1
-        note.title = "Original Title"
-        note.content = "# Original Title\n\nOriginal content."
-        note.tags = []
-        note.created_at = MagicMock()
-        note.created_at.isoformat.return_value = "2024-01-01T00:00:00"
-        note.updated_at = MagicMock()
-        note.updated_at.isoformat.return_value = "2024-01-01T00:00:00"
-        return note
-
-    @pytest.mark.asyncio
-    async def test_update_note_commit_failure_returns_500(self, mock_user, mock_db_session, mock_existing_note):
-        """Test that commit failure returns 500 and triggers rollback."""
-        # Arrange
-        note_data = NoteUpdate(content="# Updated Title\n\nUpdated content.")
-
-        # Mock execute to return the existing note
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = mock_existing_note
-        mock_db_session.execute.return_value = mock_result
-
-        mock_db_session.commit.side_effect = SQLAlchemyError("Database commit failed")
-
-        # Act & Assert
-        with pytest.raises(HTTPException) as exc_info:
-            await update_note("test-note-1", note_data, mock_user, mock_db_session)
-
-        assert exc_info.value.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
-        assert "Database error" in exc_info.value.detail
-        mock_db_session.rollback.assert_awaited_once()
-
-    @pytest.mark.asyncio
-    async def test_update_note_requery_failure_returns_500(self, mock_user, mock_db_session, mock_existing_note):
-        """Test that post-commit re-query failure returns 500 and triggers rollback."""
-        # Arrange
-        note_data = NoteUpdate(content="# Updated Title\n\nUpdated content.")
-
-        # Mock first execute to return the note, then fail the post-commit re-query.
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = mock_existing_note
-        mock_db_session.execute.side_effect = [mock_result, SQLAlchemyError("Database re-query failed")]
-
-        # Act & Assert
-        with pytest.raises(HTTPException) as exc_info:
-            await update_note("test-note-1", note_data, mock_user, mock_db_session)
-
-        assert exc_info.value.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
-        assert "Database error" in exc_info.value.detail
-        mock_db_session.rollback.assert_awaited_once()
-
-
-class TestDeleteNoteTransactionError:
-    """Test transaction error handling in delete_note endpoint."""
-
-    @pytest.fixture
-    def mock_existing_note(self):
-        """Create a mock existing note."""
-        note = MagicMock(spec=Note)
-        note.id = "test-note-1"
-        note.user_id = 1
-        note.title = "Test Note"
-        note.content = "# Test Note\n\nContent."
-        return note
-
-    @pytest.mark.asyncio
-    async def test_delete_note_commit_failure_returns_500(self, mock_user, mock_db_session, mock_existing_note):
-        """Test that commit failure returns 500 and triggers rollback."""
-        # Arrange
-        # Mock execute to return the existing note
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = mock_existing_note
-        mock_db_session.execute.return_value = mock_result
-
-        mock_db_session.commit.side_effect = SQLAlchemyError("Database commit failed")
-
-        # Act & Assert
-        with pytest.raises(HTTPException) as exc_info:
-            await delete_note("test-note-1", mock_user, mock_db_session)
-
-        assert exc_info.value.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
-        assert "Database error" in exc_info.value.detail
-        mock_db_session.rollback.assert_awaited_once()
-
-    @pytest.mark.asyncio
-    async def test_delete_note_delete_failure_returns_500(self, mock_user, mock_db_session, mock_existing_note):
-        """Test that delete failure returns 500 and triggers rollback."""
-        # Arrange
-        # Mock execute to return the existing note
-        mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = mock_existing_note
-        mock_db_session.execute.return_value = mock_result
-
-        mock_db_session.delete.side_effect = SQLAlchemyError("Database delete failed")
-
-        # Act & Assert
-        with pytest.raises(HTTPException) as exc_info:
-            await delete_note("test-note-1", mock_user, mock_db_session)
-
-        assert exc_info.value.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
-        assert "Database error" in exc_info.value.detail
-        mock_db_session.rollback.assert_awaited_once()
+def fake_existing_note():
+    """Create a fake existing note; function-scoped because update_note assigns title/content."""
+    return _FakeNote(
+        id="test-note-1",
+        user_id=1,
+        title="Original Title",
+        content="# Original Title\n\nOriginal content.",
+    )
+
+
+@pytest.mark.parametrize(
+    ("op", "failing"),
+    [
+        ("create", "commit"),
+        ("create", "requery"),
+        ("update", "commit"),
+        ("update", "requery"),
+        ("delete", "commit"),
+        ("delete", "delete"),
+    ],
+)
+async def test_transaction_error_returns_500(op, failing, fake_user, session, fake_existing_note):
+    """Test that a failed commit, delete or post-commit re-query returns 500 and triggers rollback."""
+    # Arrange: update and delete first load the existing note
+    error = SQLAlchemyError(f"Database {failing} failed")
+    if op != "create":
+        session.execute_results.append(FakeResult(fake_existing_note))
+    if failing == "requery":
+        session.execute_results.append(error)
+    else:
+        setattr(session, f"{failing}_exc", error)
+
+    # Act & Assert
+    with pytest.raises(HTTPException) as exc_info:
+        if op == "create":
+            note_data = NoteCreate(title="Test Note", content="# Test Note\n\nContent here.")
+            await create_note(note_data, fake_user, session)
+        elif op == "update":
+            note_data = NoteUpdate(content="# Updated Title\n\nUpdated content.")
+            await update_note("test-note-1", note_data, fake_user, session)
+        else:
+            await delete_note("test-note-1", fake_user, session)
+
+    assert exc_info.value.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+    assert "Database error" in exc_info.value.detail
+    assert session.calls.count(("rollback",)) == 1
@@ -3,8 +3,6 @@ Unit tests for Pydantic schemas (app.schemas.schemas).
 Tests request/response models, validation, and serialization.
 """
 
-from datetime import datetime
-
 import pytest
 from pydantic import ValidationError
 
@@ -20,11 +18,25 @@ from app.schemas.schemas import (
     UserLogin,
     UserResponse,
 )
+from tests.validation import validation_errors
+
+# Schema validation should never hit deprecated pydantic APIs; fail loudly if it does.
+# Applied only to database-free tests so warnings from DB fixture setup stay warnings.
+_no_deprecations = pytest.mark.filterwarnings("error::DeprecationWarning")
+
+# Length-boundary and large-document inputs, built once rather than per test
+_MAX_USERNAME = "a" * 50  # UserCreate.username max_length
+_TOO_LONG_USERNAME = "a" * 51
+_MAX_TITLE = "A" * 255  # NoteCreate/NoteUpdate.title max_length
+_TOO_LONG_TITLE = "a" * 256
+_LARGE_CONTENT = "# Large Note\n\n" + ("Content line.\n" * 10000)
+_FAKE_NOW = "2023-01-01T12:00:00"  # fixed timestamp for response conversions
 
 
 class TestUserSchemas:
     """Test user-related Pydantic schemas."""
 
+    @_no_deprecations
     class TestUserCreate:
         """Test UserCreate schema."""
 
@@ -51,65 +63,43 @@ class TestUserSchemas:
             assert user.username == "testuser"
             assert user.password == "testpass123"
 
-        def test_user_create_missing_username(self):
-            """Test UserCreate with missing username."""
-            with pytest.raises(ValidationError) as exc_info:
-                UserCreate(password="testpass123")
-
-            errors = exc_info.value.errors()
-            assert len(errors) == 1
-            assert errors[0]["loc"] == ("username",)
-            assert errors[0]["type"] == "missing"
-
-        def test_user_create_missing_password(self):
-            """Test UserCreate with missing password."""
-            with pytest.raises(ValidationError) as exc_info:
-                UserCreate(username="testuser")
-
-            errors = exc_info.value.errors()
-            assert len(errors) == 1
-            assert errors[0]["loc"] == ("password",)
-            assert errors[0]["type"] == "missing"
-
-        def test_user_create_empty_username(self):
-            """Test UserCreate with empty username."""
-            with pytest.raises(ValidationError) as exc_info:
-                UserCreate(username="", password="testpass123")
-
-            errors = exc_info.value.errors()
-            assert len(errors) == 1
-            assert errors[0]["loc"] == ("username",)
-            assert "at least 4 character" in str(errors[0]["msg"])
-
-        def test_user_create_empty_password(self):
-            """Test UserCreate with empty password."""
-            with pytest.raises(ValidationError) as exc_info:
-                UserCreate(username="testuser", password="")
-
-            errors = exc_info.value.errors()
-            assert len(errors) == 1
-            assert errors[0]["loc"] == ("password",)
-            assert "at least 4 character" in str(errors[0]["msg"])
-
-        def test_user_create_username_too_short(self):
-            """Test UserCreate with username too short (3 chars)."""
-            with pytest.raises(ValidationError) as exc_info:
-                UserCreate(username="abc", password="testpass123")
-
-            errors = exc_info.value.errors()
-            assert len(errors) == 1
-            assert errors[0]["loc"] == ("username",)
-            assert "at least 4 character" in str(errors[0]["msg"])
+        @pytest.mark.parametrize(
+            ("field", "value", "err_type", "msg"),
+            [
+                ("username", None, "missing", "Field required"),
+                ("password", None, "missing", "Field required"),
+                ("username", "", "string_too_short", "at least 4 character"),
+                ("password", "", "string_too_short", "at least 4 character"),
+                ("username", "abc", "string_too_short", "at least 4 character"),
+                ("password", "abc", "string_too_short", "at least 4 character"),
+                ("username", _TOO_LONG_USERNAME, "string_too_long", "at most 50 characters"),
+            ],
+            ids=[
+                "missing-username",
+                "missing-password",
+                "empty-username",
+                "empty-password",
+                "short-username",
+                "short-password",
+                "long-username",
+            ],
+        )
+        def test_user_create_invalid_field(self, field, value, err_type, msg):
+            """Test UserCreate rejects a missing, too-short or too-long field (None means omitted)."""
+            data = {"username": "testuser", "password": "testpass123"}
+            if value is None:
+                del data[field]
+            else:
+                data[field] = value
 
-        def test_user_create_password_too_short(self):
-            """Test UserCreate with password too short (3 chars)."""
             with pytest.raises(ValidationError) as exc_info:
-                UserCreate(username="testuser", password="abc")
+                UserCreate(**data)
 
-            errors = exc_info.value.errors()
+            errors = validation_errors(exc_info)
             assert len(errors) == 1
-            assert errors[0]["loc"] == ("password",)
-            assert "at least 4 character" in str(errors[0]["msg"])
+            assert errors[0]["loc"] == (field,)
+            assert errors[0]["type"] == err_type
+            assert msg in errors[0]["msg"]
 
         def test_user_create_minimum_length_boundary(self):
             """Test UserCreate with exactly minimum length (4 chars)."""
@@ -117,22 +107,11 @@ class TestUserSchemas:
             assert user.username == "abcd"
             assert user.password == "pass"
 
-        def test_user_create_username_too_long(self):
-            """Test UserCreate with username exceeding max length."""
-            long_username = "a" * 51  # Max is 50
-            with pytest.raises(ValidationError) as exc_info:
-                UserCreate(username=long_username, password="testpass123")
-
-            errors = exc_info.value.errors()
-            assert len(errors) == 1
-            assert errors[0]["loc"] == ("username",)
-            assert "at most 50 characters" in str(errors[0]["msg"])
-
         @pytest.mark.parametrize(
             "username",
             [
                 "abcd",  # Minimum length (4 chars)
-                "a" * 50,  # Maximum length
+                _MAX_USERNAME,  # Maximum length
                 "user_with_underscore",
                 "user-with-dash",
                 "user.with.dots",
@@ -143,7 +122,7 @@ class TestUserSchemas:
         )
         def test_user_create_username_valid_formats(self, username):
             """Test UserCreate with various valid username formats."""
-            user = UserCreate(username=username, password="testpass123")
+            user = UserCreate.model_validate({"username": username, "password": "testpass123"})
             assert user.username == username
 
         @pytest.mark.parametrize(
@@ -162,9 +141,10 @@ class TestUserSchemas:
         )
         def test_user_create_password_valid_formats(self, password):
             """Test UserCreate with various valid password formats."""
-            user = UserCreate(username="testuser", password=password)
+            user = UserCreate.model_validate({"username": "testuser", "password": password})
             assert user.password == password
 
+    @_no_deprecations
     class TestUserLogin:
         """Test UserLogin schema."""
 
@@ -180,8 +160,8 @@ class TestUserSchemas:
             with pytest.raises(ValidationError) as exc_info:
                 UserLogin(username="testuser")
 
-            errors = exc_info.value.errors()
-            assert any(error["loc"] == ("password",) for error in errors)
+            errors = validation_errors(exc_info)
+            assert "password" in {error["loc"][0] for error in errors}
 
         def test_user_login_json_serialization(self):
             """Test UserLogin JSON serialization."""
@@ -193,18 +173,20 @@ class TestUserSchemas:
     class TestUserResponse:
         """Test UserResponse schema."""
 
+        @_no_deprecations
         def test_user_response_valid(self):
             """Test valid user response data."""
             response = UserResponse(username="testuser")
 
             assert response.username == "testuser"
 
+        @_no_deprecations
         def test_user_response_missing_username(self):
             """Test UserResponse with missing username."""
             with pytest.raises(ValidationError) as exc_info:
                 UserResponse()
 
-            errors = exc_info.value.errors()
+            errors = validation_errors(exc_info)
             assert len(errors) == 1
             assert errors[0]["loc"] == ("username",)
 
@@ -227,6 +209,7 @@ class TestUserSchemas:
 class TestTokenSchemas:
     """Test token-related Pydantic schemas."""
 
+    @_no_deprecations
     class TestToken:
         """Test Token schema."""
 
@@ -249,8 +232,8 @@ class TestTokenSchemas:
             with pytest.raises(ValidationError) as exc_info:
                 Token()
 
-            errors = exc_info.value.errors()
-            assert any(error["loc"] == ("access_token",) for error in errors)
+            errors = validation_errors(exc_info)
+            assert "access_token" in {error["loc"][0] for error in errors}
 
         def test_token_json_serialization(self):
             """Test Token JSON serialization."""
@@ -259,6 +242,7 @@ class TestTokenSchemas:
 
             assert json_data == {"access_token": "abc123", "refresh_token": "xyz789", "token_type": "bearer"}
 
+    @_no_deprecations
     class TestTokenData:
         """Test TokenData schema."""
 
@@ -284,6 +268,7 @@ class TestTokenSchemas:
 class TestNoteSchemas:
     """Test note-related Pydantic schemas."""
 
+    @_no_deprecations
     class TestNoteCreate:
         """Test NoteCreate schema."""
 
@@ -325,54 +310,31 @@ class TestNoteSchemas:
             assert note.content == "Test content"
             assert note.title is None
 
-        def test_note_create_missing_content(self):
-            """Test NoteCreate with missing content."""
-            with pytest.raises(ValidationError) as exc_info:
-                NoteCreate(title="Test Note")
-
-            errors = exc_info.value.errors()
-            assert any(error["loc"] == ("content",) for error in errors)
-
-        def test_note_create_empty_title(self):
-            """Test NoteCreate with empty title."""
-            with pytest.raises(ValidationError) as exc_info:
-                NoteCreate(title="", content="Test content")
-
-            errors = exc_info.value.errors()
-            assert any(error["loc"] == ("title",) for error in errors)
-
-        def test_note_create_title_too_long(self):
-            """Test NoteCreate with title exceeding max length."""
-            long_title = "a" * 256  # Max is 255
-            with pytest.raises(ValidationError) as exc_info:
-                NoteCreate(title=long_title, content="Test content")
-
-            errors = exc_info.value.errors()
-            assert any(error["loc"] == ("title",) for error in errors)
-
-        def test_note_create_empty_content_not_allowed(self):
-            """Test NoteCreate with empty content (minimum length 4)."""
-            with pytest.raises(ValidationError) as exc_info:
-                NoteCreate(title="Test Note", content="")
-
-            errors = exc_info.value.errors()
-            assert any(error["loc"] == ("content",) for error in errors)
-
-        def test_note_create_content_too_short(self):
-            """Test NoteCreate with content too short (3 chars)."""
-            with pytest.raises(ValidationError) as exc_info:
-                NoteCreate(title="Test Note", content="abc")
-
-            errors = exc_info.value.errors()
-            assert any(error["loc"] == ("content",) for error in errors)
+        @pytest.mark.parametrize(
+            ("field", "value"),
+            [
+                ("content", None),
+                ("title", ""),
+                ("title", "abc"),
+                ("title", _TOO_LONG_TITLE),
+                ("content", ""),
+                ("content", "abc"),
+            ],
+            ids=["missing-content", "empty-title", "short-title", "long-title", "empty-content", "short-content"],
+        )
+        def test_note_create_invalid_field(self, field, value):
+            """Test NoteCreate rejects a missing, too-short or too-long field (None means omitted)."""
+            data = {"title": "Test Note", "content": "Test content"}
+            if value is None:
+                del data[field]
+            else:
+                data[field] = value
 
-        def test_note_create_title_too_short(self):
-            """Test NoteCreate with title too short (3 chars, min is 4)."""
             with pytest.raises(ValidationError) as exc_info:
-                NoteCreate(title="abc", content="Test content")
+                NoteCreate(**data)
 
-            errors = exc_info.value.errors()
-            assert any(error["loc"] == ("title",) for error in errors)
+            errors = validation_errors(exc_info)
+            assert field in {error["loc"][0] for error in errors}
 
         def test_note_create_minimum_length_boundary(self):
             """Test NoteCreate with exactly minimum length (4 char title, 4 char content)."""
@@ -384,7 +346,7 @@ class TestNoteSchemas:
             "title",
             [
                 "Shrt",  # Minimum length (4 chars)
-                "A" * 255,  # Maximum length
+                _MAX_TITLE,  # Maximum length
                 "Title with spaces",
                 "Title-with-dashes",
                 "Title_with_underscores",
@@ -401,13 +363,13 @@ class TestNoteSchemas:
 
         def test_note_create_large_content(self):
             """Test NoteCreate with large content."""
-            large_content = "# Large Note\n\n" + ("Content line.\n" * 10000)
-            note = NoteCreate(title="Large Note", content=large_content)
+            note = NoteCreate(title="Large Note", content=_LARGE_CONTENT)
 
             assert note.title == "Large Note"
-            assert note.content == large_content
+            assert note.content == _LARGE_CONTENT
             assert len(note.content) > 100000
 
+    @_no_deprecations
     class TestNoteUpdate:
         """Test NoteUpdate schema."""
 
@@ -473,7 +435,7 @@ class TestNoteSchemas:
             with pytest.raises(ValidationError) as exc_info:
                 NoteUpdate(title="", content="")
 
-            errors = exc_info.value.errors()
+            errors = validation_errors(exc_info)
             # Should have errors for both title and content being too short
             error_fields = {error["loc"][0] for error in errors}
             assert "title" in error_fields
@@ -484,7 +446,7 @@ class TestNoteSchemas:
             with pytest.raises(ValidationError) as exc_info:
                 NoteUpdate(title="abc", content="def")
 
-            errors = exc_info.value.errors()
+            errors = validation_errors(exc_info)
             error_fields = {error["loc"][0] for error in errors}
             assert "title" in error_fields
             assert "content" in error_fields
@@ -498,9 +460,8 @@ class TestNoteSchemas:
         def test_note_update_validation_constraints(self):
             """Test NoteUpdate respects validation constraints."""
             # Title too long
-            long_title = "a" * 256
             with pytest.raises(ValidationError):
-                NoteUpdate(title=long_title)
+                NoteUpdate(title=_TOO_LONG_TITLE)
 
         def test_note_update_json_serialization(self):
             """Test NoteUpdate JSON serialization with partial data."""
@@ -513,6 +474,7 @@ class TestNoteSchemas:
     class TestNoteResponse:
         """Test NoteResponse schema."""
 
+        @_no_deprecations
         def test_note_response_valid(self):
             """Test valid note response data."""
             # F19: accessCount and lastAccessedAt are removed from NoteResponse.
@@ -536,12 +498,13 @@ class TestNoteSchemas:
                 "lastAccessedAt must not be a field on NoteResponse after F19"
             )
 
+        @_no_deprecations
         def test_note_response_missing_fields(self):
             """Test NoteResponse with missing required fields."""
             with pytest.raises(ValidationError) as exc_info:
                 NoteResponse(title="Test Note")
 
-            errors = exc_info.value.errors()
+            errors = validation_errors(exc_info)
             required_fields = {"id", "content", "createdAt", "updatedAt"}
             error_fields = {error["loc"][0] for error in errors}
 
@@ -562,9 +525,8 @@ class TestNoteSchemas:
             assert response.title == sample_note.title
             assert response.content == sample_note.content
             assert response.tags == []
-            assert isinstance(response.createdAt, str)
-            assert isinstance(response.updatedAt, str)
 
+        @_no_deprecations
         def test_note_response_with_tags(self):
             """Test NoteResponse preserves backend-normalized tags."""
             response = NoteResponse(
@@ -578,6 +540,7 @@ class TestNoteSchemas:
 
             assert response.tags == ["ideas", "work"]
 
+        @_no_deprecations
         def test_note_response_datetime_formatting(self):
             """Test NoteResponse with various datetime formats."""
             iso_datetime = "2023-01-01T12:00:00.000Z"
@@ -592,6 +555,7 @@ class TestNoteSchemas:
 class TestResponseSchemas:
     """Test response-related Pydantic schemas."""
 
+    @_no_deprecations
     class TestMessageResponse:
         """Test MessageResponse schema."""
 
@@ -606,6 +570,7 @@ class TestResponseSchemas:
             with pytest.raises(ValidationError):
                 MessageResponse()
 
+    @_no_deprecations
     class TestDeleteResponse:
         """Test DeleteResponse schema."""
 
@@ -621,10 +586,11 @@ class TestResponseSchemas:
             with pytest.raises(ValidationError) as exc_info:
                 DeleteResponse(message="Deleted")
 
-            errors = exc_info.value.errors()
-            assert any(error["loc"] == ("deleted_id",) for error in errors)
+            errors = validation_errors(exc_info)
+            assert "deleted_id" in {error["loc"][0] for error in errors}
 
 
+@_no_deprecations
 class TestSchemaIntegration:
     """Test integration between different schemas."""
 
@@ -645,13 +611,12 @@ class TestSchemaIntegration:
         note_create = NoteCreate(title="Test Note", content="# Test Note\n\nContent")
 
         # Simulate what would happen in the API
-        current_time = datetime.now().isoformat()
         note_response = NoteResponse(
             id="note-123",
             title=note_create.title,
             content=note_create.content,
-            createdAt=current_time,
-            updatedAt=current_time,
+            createdAt=_FAKE_NOW,
+            updatedAt=_FAKE_NOW,
         )
 
         assert note_response.title == note_create.title
@@ -674,12 +639,8 @@ class TestSchemaIntegration:
         update = NoteUpdate(title="Updated Title")
 
         # Simulate partial update
-        updated_data = original_note.model_dump()
         update_data = update.model_dump(exclude_none=True)
-        updated_data.update(update_data)
-        updated_data["updatedAt"] = "2023-01-01T13:00:00"
-
-        updated_note = NoteResponse(**updated_data)
+        updated_note = original_note.model_copy(update={**update_data, "updatedAt": "2023-01-01T13:00:00"})
 
         assert updated_note.title == "Updated Title"
         assert updated_note.content == "Original content"  # Unchanged
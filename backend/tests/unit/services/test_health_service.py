@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from unittest.mock import AsyncMock, MagicMock
+from types import SimpleNamespace
 
 import pytest
 from sqlalchemy import text
@@ -10,30 +10,37 @@ from sqlalchemy import text
 from app.services.health_service import HealthService
 from app.version import VERSION
 
+pytestmark = pytest.mark.asyncio(loop_scope="module")
+
+_SELECT_1_SQL = str(text("SELECT 1"))
+
 
-@pytest.mark.asyncio
 async def test_check_database_connection_success():
     """The service should execute a lightweight query and report healthy."""
-    session = MagicMock()
-    session.execute = AsyncMock()
+    executed = []
+
+    async def execute(statement):
+        executed.append(statement)
+
+    session = SimpleNamespace(execute=execute)
 
     assert await HealthService.check_database_connection(session) is True
 
-    session.execute.assert_called_once()
-    executed_query = session.execute.call_args[0][0]
-    assert str(executed_query) == str(text("SELECT 1"))
+    assert len(executed) == 1
+    assert str(executed[0]) == _SELECT_1_SQL
 
 
-@pytest.mark.asyncio
 async def test_check_database_connection_failure_returns_false():
     """Database exceptions should be caught and return False."""
-    session = MagicMock()
-    session.execute = AsyncMock(side_effect=RuntimeError("db down"))
+
+    async def execute(_):
+        raise RuntimeError("db down")
+
+    session = SimpleNamespace(execute=execute)
 
     assert await HealthService.check_database_connection(session) is False
 
 
-@pytest.mark.asyncio
 async def test_get_health_status_returns_expected_payload(monkeypatch):
     """Healthy database connections should yield the full status payload."""
 
@@ -46,7 +53,7 @@ async def test_get_health_status_returns_expected_payload(monkeypatch):
         staticmethod(mock_check_connection),
     )
 
-    status = await HealthService.get_health_status(MagicMock())
+    status = await HealthService.get_health_status(SimpleNamespace())
 
     assert status["status"] == "healthy"
     assert status["database"] == "connected"
@@ -56,7 +63,6 @@ async def test_get_health_status_returns_expected_payload(monkeypatch):
     assert "buildDate" in status
 
 
-@pytest.mark.asyncio
 async def test_get_health_status_raises_when_database_unavailable(monkeypatch):
     """The service should raise when the database health check fails."""
 
@@ -70,4 +76,4 @@ async def test_get_health_status_raises_when_database_unavailable(monkeypatch):
     )
 
     with pytest.raises(Exception, match="Database connection failed"):
-        await HealthService.get_health_status(MagicMock())
+        await HealthService.get_health_status(SimpleNamespace())
@@ -10,6 +10,8 @@ from app.services.note_events import (
     create_note_event_listener,
 )
 
+pytestmark = pytest.mark.asyncio(loop_scope="module")
+
 
 def test_subscribe_rejects_non_positive_queue_limit():
     broker = NoteEventBroker()
@@ -97,7 +99,6 @@ def test_publish_payload_rejects_missing_or_invalid_fields():
         broker.publish_payload({"user_id": "3", "kind": "deleted", "note_id": 44})
 
 
-@pytest.mark.asyncio
 async def test_listener_start_registers_exactly_one_listen_connection(monkeypatch):
     connections = []
 
@@ -143,7 +144,6 @@ async def test_listener_start_registers_exactly_one_listen_connection(monkeypatc
     assert connections[0].closed is True
 
 
-@pytest.mark.asyncio
 async def test_listener_callback_publishes_valid_json_payload(monkeypatch):
     callback_holder = {}
 
@@ -175,7 +175,6 @@ async def test_listener_callback_publishes_valid_json_payload(monkeypatch):
     await listener.stop()
 
 
-@pytest.mark.asyncio
 async def test_listener_start_failure_closes_connection(monkeypatch):
     class FakeConnection:
         def __init__(self):
@@ -203,7 +202,6 @@ async def test_listener_start_failure_closes_connection(monkeypatch):
     assert listener.started is False
 
 
-@pytest.mark.asyncio
 async def test_listener_stop_closes_connection_when_remove_listener_fails(monkeypatch):
     class FakeConnection:
         def __init__(self):
@@ -233,7 +231,6 @@ async def test_listener_stop_closes_connection_when_remove_listener_fails(monkey
     assert listener.started is False
 
 
-@pytest.mark.asyncio
 async def test_listener_callback_ignores_wrong_channel_and_invalid_payload(monkeypatch):
     callback_holder = {}
 
@@ -3,10 +3,22 @@ Unit tests for settings-related Pydantic schemas.
 Tests validation for PasswordChangeRequest, AccountDeleteRequest, and UserInfoResponse.
 """
 
+from types import MappingProxyType
+
 import pytest
 from pydantic import ValidationError
 
 from app.schemas.schemas import AccountDeleteRequest, PasswordChangeRequest, UserInfoResponse
+from tests.validation import validation_errors
+
+_BASE_USER_INFO = MappingProxyType(
+    {
+        "username": "testuser",
+        "created_at": "2025-01-01T00:00:00Z",
+        "notes_count": 5,
+        "auth_provider": "local",
+    }
+)
 
 
 class TestPasswordChangeRequest:
@@ -20,41 +32,38 @@ class TestPasswordChangeRequest:
         assert request.current_password == "oldpass123"
         assert request.new_password == "newpass456"
 
-    def test_password_minimum_length_validation(self):
-        """Test that passwords must meet minimum length requirement."""
-        # Current password too short
+    @pytest.mark.parametrize(
+        ("current", "new", "field"),
+        [
+            ("abc", "validpass123", "current_password"),
+            ("validpass123", "abc", "new_password"),
+            ("", "newpass123", "current_password"),
+            ("oldpass123", "", "new_password"),
+        ],
+        ids=["current_too_short", "new_too_short", "current_empty", "new_empty"],
+    )
+    def test_invalid_passwords_rejected(self, current, new, field):
+        """Test that short or empty passwords are rejected."""
         with pytest.raises(ValidationError) as exc_info:
-            PasswordChangeRequest(current_password="abc", new_password="validpass123")
-
-        assert "at least 4 characters" in str(exc_info.value)
-
-        # New password too short
-        with pytest.raises(ValidationError) as exc_info:
-            PasswordChangeRequest(current_password="validpass123", new_password="abc")
-
-        assert "at least 4 characters" in str(exc_info.value)
-
-    def test_missing_required_fields(self):
+            PasswordChangeRequest(current_password=current, new_password=new)
+
+        errors = validation_errors(exc_info)
+        assert [error["loc"] for error in errors] == [(field,)]
+        assert "at least 4 characters" in errors[0]["msg"]
+
+    @pytest.mark.parametrize(
+        ("data", "missing"),
+        [
+            ({"new_password": "newpass123"}, "current_password"),
+            ({"current_password": "oldpass123"}, "new_password"),
+        ],
+    )
+    def test_missing_required_fields(self, data, missing):
         """Test that all required fields must be provided."""
-        # Missing current_password
-        with pytest.raises(ValidationError) as exc_info:
-            PasswordChangeRequest(new_password="newpass123")
-
-        assert "current_password" in str(exc_info.value)
-
-        # Missing new_password
         with pytest.raises(ValidationError) as exc_info:
-            PasswordChangeRequest(current_password="oldpass123")
-
-        assert "new_password" in str(exc_info.value)
-
-    def test_empty_passwords_rejected(self):
-        """Test that empty passwords are rejected."""
-        with pytest.raises(ValidationError):
-            PasswordChangeRequest(current_password="", new_password="newpass123")
+            PasswordChangeRequest(**data)
 
-        with pytest.raises(ValidationError):
-            PasswordChangeRequest(current_password="oldpass123", new_password="")
+        assert [error["loc"] for error in validation_errors(exc_info)] == [(missing,)]
 
 
 class TestAccountDeleteRequest:
@@ -72,14 +81,16 @@ class TestAccountDeleteRequest:
         with pytest.raises(ValidationError) as exc_info:
             AccountDeleteRequest(password="abc")
 
-        assert "at least 4 characters" in str(exc_info.value)
+        errors = validation_errors(exc_info)
+        assert [error["loc"] for error in errors] == [("password",)]
+        assert "at least 4 characters" in errors[0]["msg"]
 
     def test_missing_password_field(self):
         """Test that password field is required."""
         with pytest.raises(ValidationError) as exc_info:
             AccountDeleteRequest()
 
-        assert "password" in str(exc_info.value)
+        assert [error["loc"] for error in validation_errors(exc_info)] == [("password",)]
 
     def test_empty_password_rejected(self):
         """Test that empty password is rejected."""
@@ -92,13 +103,7 @@ class TestUserInfoResponse:
 
     def test_valid_user_info_response(self):
         """Test creating valid user info response."""
-        data = {
-            "username": "testuser",
-            "email": "test@example.com",
-            "created_at": "2025-01-01T00:00:00Z",
-            "notes_count": 5,
-            "auth_provider": "local",
-        }
+        data = {**_BASE_USER_INFO, "email": "test@example.com"}
         response = UserInfoResponse(**data)
 
         assert response.username == "testuser"
@@ -109,12 +114,7 @@ class TestUserInfoResponse:
 
     def test_user_info_response_without_email(self):
         """Test creating user info response without email (local user)."""
-        data = {
-            "username": "localuser",
-            "created_at": "2025-01-01T00:00:00Z",
-            "notes_count": 10,
-            "auth_provider": "local",
-        }
+        data = {**_BASE_USER_INFO, "username": "localuser", "notes_count": 10}
         response = UserInfoResponse(**data)
 
         assert response.username == "localuser"
@@ -124,9 +124,9 @@ class TestUserInfoResponse:
     def test_user_info_response_oidc_user(self):
         """Test creating user info response for OIDC user."""
         data = {
+            **_BASE_USER_INFO,
             "username": "oidcuser",
             "email": "oidc@provider.com",
-            "created_at": "2025-01-01T00:00:00Z",
             "notes_count": 3,
             "auth_provider": "oidc",
         }
@@ -136,68 +136,24 @@ class TestUserInfoResponse:
         assert response.email == "oidc@provider.com"
         assert response.auth_provider == "oidc"
 
-    def test_notes_count_validation(self):
-        """Test that notes_count must be provided."""
-        with pytest.raises(ValidationError) as exc_info:
-            UserInfoResponse(
-                username="testuser",
-                created_at="2025-01-01T00:00:00Z",
-                auth_provider="local",
-            )
-
-        assert "notes_count" in str(exc_info.value)
-
-    def test_missing_required_fields(self):
+    @pytest.mark.parametrize("missing", ["username", "created_at", "notes_count", "auth_provider"])
+    def test_missing_required_field(self, missing):
         """Test that all required fields must be provided."""
-        # Missing username
-        with pytest.raises(ValidationError) as exc_info:
-            UserInfoResponse(
-                created_at="2025-01-01T00:00:00Z",
-                notes_count=5,
-                auth_provider="local",
-            )
-
-        assert "username" in str(exc_info.value)
-
-        # Missing created_at
-        with pytest.raises(ValidationError) as exc_info:
-            UserInfoResponse(
-                username="testuser",
-                notes_count=5,
-                auth_provider="local",
-            )
-
-        assert "created_at" in str(exc_info.value)
-
-        # Missing auth_provider
+        data = {k: v for k, v in _BASE_USER_INFO.items() if k != missing}
         with pytest.raises(ValidationError) as exc_info:
-            UserInfoResponse(
-                username="testuser",
-                created_at="2025-01-01T00:00:00Z",
-                notes_count=5,
-            )
+            UserInfoResponse(**data)
 
-        assert "auth_provider" in str(exc_info.value)
+        assert [error["loc"] for error in validation_errors(exc_info)] == [(missing,)]
 
     def test_notes_count_must_be_integer(self):
         """Test that notes_count must be an integer."""
         # String should be coerced to int if valid
-        response = UserInfoResponse(
-            username="testuser",
-            created_at="2025-01-01T00:00:00Z",
-            notes_count="5",
-            auth_provider="local",
-        )
+        response = UserInfoResponse(**{**_BASE_USER_INFO, "notes_count": "5"})
         assert response.notes_count == 5
 
         # Invalid string should fail
         with pytest.raises(ValidationError):
-            UserInfoResponse(
-                username="testuser",
-                created_at="2025-01-01T00:00:00Z",
-                notes_count="invalid",
-                auth_provider="local",
-            )
+            UserInfoResponse(**{**_BASE_USER_INFO, "notes_count": "invalid"})
 
     def test_model_config_from_attributes(self):
         """Test that model can be created from ORM objects."""
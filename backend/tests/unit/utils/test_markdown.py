@@ -8,6 +8,22 @@ import pytest
 from app.utils.markdown import MarkdownService, markdown_service
 
 
+class _HashSpy(str):
+    """A str that records whether it was hashed, i.e. used as a cache key."""
+
+    hashed = False
+
+    def __hash__(self):
+        self.hashed = True
+        return super().__hash__()
+
+
+@pytest.fixture
+def small_cache_limit(monkeypatch):
+    """Lower the memoization limit so the uncached path is reachable with short inputs."""
+    monkeypatch.setattr("app.utils.markdown.CACHE_MAX_CONTENT_LENGTH", 16)
+
+
 class TestMarkdownServiceExtractTitle:
     """Test extract_title method."""
 
@@ -57,6 +73,45 @@ class TestMarkdownServiceExtractTitle:
         title = markdown_service.extract_title(content)
         assert title == "这是中文标题 🚀"
 
+    @pytest.mark.usefixtures("small_cache_limit")
+    def test_extract_title_large_input_not_cached(self):
+        """Test that only content within the cache limit is used as a cache key."""
+        short = _HashSpy("# Note")
+        large = _HashSpy("# Big Note\n\n" + "x" * 16)
+
+        assert markdown_service.extract_title(short) == "Note"
+        assert markdown_service.extract_title(large) == "Big Note"
+
+        assert short.hashed
+        assert not large.hashed
+
+    @pytest.mark.parametrize(
+        "content,expected",
+        [
+            ("#  ", ""),
+            ("# \n", "Untitled Note"),
+            ("#\n\nx", "x"),
+            ("#\t\r", ""),
+            ("\n#  \n# a", "# a"),
+            ("# \n\n", "Untitled Note"),
+            ("#\n \n", ""),
+            ("a\n#\u3000b", "b"),
+        ],
+        ids=[
+            "trailing_spaces",
+            "space_newline",
+            "newline_crossing",
+            "tab_cr",
+            "second_line",
+            "blank_lines",
+            "newline_space",
+            "unicode_space",
+        ],
+    )
+    def test_extract_title_whitespace_edge_cases(self, content, expected):
+        """Test H1_REGEX semantics for whitespace-only and newline-crossing headings."""
+        assert markdown_service.extract_title(content) == expected
+
 
 class TestMarkdownServiceFormatContent:
     """Test format_content method."""
@@ -95,6 +150,18 @@ class TestMarkdownServiceFormatContent:
         formatted = markdown_service.format_content("   \n  \t  \n  ")
         assert formatted == ""
 
+    @pytest.mark.usefixtures("small_cache_limit")
+    def test_format_content_large_input_not_cached(self):
+        """Test that only content within the cache limit is used as a cache key."""
+        short = _HashSpy("# Note")
+        large = _HashSpy("# Big Note\n\n" + "x" * 16)
+
+        assert markdown_service.format_content(short) == "# Note\n\n"
+        assert markdown_service.format_content(large) == large
+
+        assert short.hashed
+        assert not large.hashed
+
 
 class TestMarkdownServiceRemoveH1:
     """Test remove_h1 method."""
@@ -160,45 +227,23 @@ class TestMarkdownServiceCreateEmptyNote:
         content = markdown_service.create_empty_note()
         assert content == "# New Note\n\n"
 
-    def test_create_empty_note_custom_title(self):
-        """Test creating empty note with custom title."""
-        content = markdown_service.create_empty_note("My Custom Title")
-        assert content == "# My Custom Title\n\n"
-
-    def test_create_empty_note_empty_title(self):
-        """Test creating empty note with empty title."""
-        content = markdown_service.create_empty_note("")
-        assert content == "# \n\n"
-
-    def test_create_empty_note_with_spaces(self):
-        """Test creating empty note with title containing spaces."""
-        content = markdown_service.create_empty_note("Title With Spaces")
-        assert content == "# Title With Spaces\n\n"
-
-    def test_create_empty_note_with_special_chars(self):
-        """Test creating empty note with special characters in title."""
-        content = markdown_service.create_empty_note("Title @#$%^&*()")
-        assert content == "# Title @#$%^&*()\n\n"
-
-    def test_create_empty_note_unicode(self):
-        """Test creating empty note with Unicode title."""
-        content = markdown_service.create_empty_note("标题 🚀")
-        assert content == "# 标题 🚀\n\n"
-
     @pytest.mark.parametrize(
         "title,expected",
         [
             ("Test", "# Test\n\n"),
+            ("My Custom Title", "# My Custom Title\n\n"),
             ("", "# \n\n"),
-            ("Title with spaces", "# Title with spaces\n\n"),
+            ("Title With Spaces", "# Title With Spaces\n\n"),
+            ("Title @#$%^&*()", "# Title @#$%^&*()\n\n"),
             ("123 Numeric Title", "# 123 Numeric Title\n\n"),
+            ("标题 🚀", "# 标题 🚀\n\n"),
             ("🎉 Emoji Title", "# 🎉 Emoji Title\n\n"),
         ],
+        ids=["simple", "custom", "empty", "spaces", "special_chars", "numeric", "unicode", "emoji"],
     )
     def test_create_empty_note_parametrized(self, title, expected):
         """Test create_empty_note with various titles."""
-        content = markdown_service.create_empty_note(title)
-        assert content == expected
+        assert markdown_service.create_empty_note(title) == expected
 
 
 class TestMarkdownServiceIntegration:
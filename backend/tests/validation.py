@@ -0,0 +1,11 @@
+"""
+Helpers for asserting on pydantic ValidationError contents in tests.
+"""
+
+import pytest
+from pydantic import ValidationError
+
+
+def validation_errors(exc_info: pytest.ExceptionInfo[ValidationError]) -> list:
+    """Return validation errors without the docs URL, context and input echo, which tests never inspect."""
+    return exc_info.value.errors(include_url=False, include_context=False, include_input=False)